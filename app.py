@@ -6,14 +6,24 @@ from langchain_community.vectorstores import FAISS
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from utils.llm import get_llm, get_embeddings
-from utils.data_tools import load_dataframe, dataframe_to_documents, load_pdf_documents
+from utils.data_tools import (
+    load_dataframe,
+    load_excel_sheets,
+    dataframe_to_documents,
+    workbook_to_documents,
+    load_pdf_documents,
+)
 from utils.visualization import visualize_missing, visualize_distributions
+from utils.uploads import save_upload
 
 UPLOAD_DIR = "data/uploads"
 VECTOR_DIR = "vectorstore/faiss_index"
+INDEX_CACHE_DIR = "vectorstore/by_hash"
+SOURCE_MARKER = os.path.join(VECTOR_DIR, "source.sha256")
 
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(VECTOR_DIR, exist_ok=True)
+os.makedirs(INDEX_CACHE_DIR, exist_ok=True)
 
 st.set_page_config(page_title="InsightRAG – Data Analysis Assistant", layout="wide")
 st.title("📊 InsightRAG – AI Data Analysis Assistant")
@@ -71,32 +81,59 @@ def _validate_vectorstore(vs):
     except Exception:
         return False
 
-# Load or initialize vectorstore
-vectorstore = None
-if os.path.exists(VECTOR_DIR) and os.listdir(VECTOR_DIR):
+def _read_active_digest():
+    """Return the content hash of the upload the active index was built from, if any."""
+    try:
+        with open(SOURCE_MARKER) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def _activate_vectorstore(vs, digest):
+    """Persist vs as the active index and record which upload it came from."""
+    # Drop the old marker first so a failed save can never pair it with the new index
+    if os.path.exists(SOURCE_MARKER):
+        os.remove(SOURCE_MARKER)
+    vs.save_local(VECTOR_DIR)
+    tmp_marker = SOURCE_MARKER + ".part"
+    with open(tmp_marker, "w") as f:
+        f.write(digest)
+    os.replace(tmp_marker, SOURCE_MARKER)
+
+def _load_vectorstore(index_dir):
+    """Load an index from disk; return None (and delete it) if missing or corrupted."""
+    if not (os.path.isdir(index_dir) and os.listdir(index_dir)):
+        return None
     try:
-        vectorstore = FAISS.load_local(
-            VECTOR_DIR,
+        vs = FAISS.load_local(
+            index_dir,
             embeddings,
             allow_dangerous_deserialization=True
         )
         # normalize keys right after loading
-        _normalize_faiss_index_keys(vectorstore)
-
-        # Validate the vectorstore; if corrupted, delete and rebuild
-        if not _validate_vectorstore(vectorstore):
-            st.warning("Corrupted vector index detected. Rebuilding from scratch...")
-            vectorstore = None
-            # Delete corrupted index files
-            import shutil
-            shutil.rmtree(VECTOR_DIR, ignore_errors=True)
-            os.makedirs(VECTOR_DIR, exist_ok=True)
+        _normalize_faiss_index_keys(vs)
+        if _validate_vectorstore(vs):
+            return vs
+        st.warning("Corrupted vector index detected. Rebuilding from scratch...")
     except Exception as e:
-        st.warning(f"Failed to load vector index: {e}. Starting fresh...")
-        vectorstore = None
-        import shutil
-        shutil.rmtree(VECTOR_DIR, ignore_errors=True)
-        os.makedirs(VECTOR_DIR, exist_ok=True)
+        st.warning(f"Failed to load vector index: {e}. Rebuilding from scratch...")
+    # Delete corrupted index files
+    import shutil
+    shutil.rmtree(index_dir, ignore_errors=True)
+    return None
+
+@st.cache_data(show_spinner=False)
+def _load_dataframe_cached(path):
+    # Upload paths are content-addressed, so the path alone identifies the data
+    return load_dataframe(path)
+
+@st.cache_data(show_spinner=False)
+def _load_excel_sheets_cached(path, digest):
+    return load_excel_sheets(path, digest=digest)
+
+# Load or initialize vectorstore
+vectorstore = _load_vectorstore(VECTOR_DIR)
+os.makedirs(VECTOR_DIR, exist_ok=True)
 
 # Sidebar upload
 st.sidebar.header("Upload Data")
@@ -108,43 +145,72 @@ file = st.sidebar.file_uploader(
 df = None
 
 if file:
-    save_path = os.path.join(UPLOAD_DIR, file.name)
-    with open(save_path, "wb") as f:
-        f.write(file.getbuffer())
-
-    if file.name.endswith(("csv", "xlsx")):
-        df = load_dataframe(save_path)
+    # Uploads are stored by content hash; identical bytes are never written twice
+    save_path, digest = save_upload(file, UPLOAD_DIR)
+    is_table = file.name.endswith(("csv", "xlsx"))
+    cached_index_dir = os.path.join(INDEX_CACHE_DIR, digest)
+
+    sheets = None
+
+    if is_table:
+        if file.name.endswith("xlsx"):
+            # All sheets are indexed; the selected one drives the summary and charts
+            sheets = _load_excel_sheets_cached(save_path, digest)
+            # Blank or notes-only tabs have no columns to summarise or chart
+            data_sheets = [name for name, sheet in sheets.items() if len(sheet.columns)]
+            if not data_sheets:
+                st.sidebar.error("This workbook has no sheets with data.")
+                st.stop()
+            sheet_name = data_sheets[0]
+            if len(data_sheets) > 1:
+                sheet_name = st.sidebar.selectbox("Sheet", data_sheets)
+            df = sheets[sheet_name]
+        else:
+            df = _load_dataframe_cached(save_path)
         st.sidebar.success("Dataset loaded")
 
         st.sidebar.write("Rows:", df.shape[0])
         st.sidebar.write("Columns:", df.shape[1])
         st.sidebar.write("Column Names:", df.columns.tolist())
 
-        docs = dataframe_to_documents(df, file.name)
+    cached_vectorstore = None
+    already_active = vectorstore is not None and _read_active_digest() == digest
+    if not already_active:
+        cached_vectorstore = _load_vectorstore(cached_index_dir)
+
+    if already_active:
+        # Same content as the active index: nothing to parse, embed or rebuild
+        st.sidebar.success("File already indexed")
+    elif cached_vectorstore is not None:
+        # Previously ingested upload: reuse its saved index instead of re-embedding
+        vectorstore = cached_vectorstore
+        _activate_vectorstore(vectorstore, digest)
+        st.sidebar.success("Loaded existing index for this file")
+    else:
+        if sheets is not None:
+            docs = workbook_to_documents(sheets, file.name)
+            st.info("Building vector index from documents...")
+        elif is_table:
+            docs = dataframe_to_documents(df, file.name)
+            st.info("Building vector index from documents...")
+        else:
+            docs = load_pdf_documents(save_path)
+            splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+            docs = splitter.split_documents(docs)
+            st.info("Building vector index from PDF documents...")
 
         # Always rebuild from scratch to avoid key mismatch issues
-        st.info("Building vector index from documents...")
         vectorstore = FAISS.from_documents(docs, embeddings)
         _normalize_faiss_index_keys(vectorstore)
-        vectorstore.save_local(VECTOR_DIR)
-        st.sidebar.success("Dataset indexed successfully")
+        vectorstore.save_local(cached_index_dir)
+        _activate_vectorstore(vectorstore, digest)
+        st.sidebar.success("Dataset indexed successfully" if is_table else "PDF indexed successfully")
 
+    if is_table:
         st.subheader("📈 Automatic Data Visualizations")
         visualize_missing(df)
         visualize_distributions(df)
 
-    else:
-        docs = load_pdf_documents(save_path)
-        splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-        docs = splitter.split_documents(docs)
-
-        # Always rebuild from scratch to avoid key mismatch issues
-        st.info("Building vector index from PDF documents...")
-        vectorstore = FAISS.from_documents(docs, embeddings)
-        _normalize_faiss_index_keys(vectorstore)
-        vectorstore.save_local(VECTOR_DIR)
-        st.sidebar.success("PDF indexed successfully")
-
 # Q&A Section
 st.subheader("Ask Questions About Your Data")
 
@@ -177,8 +243,11 @@ if question and vectorstore:
             st.warning("No relevant documents found for your question. Try rephrasing or uploading more data.")
     except KeyError as e:
         st.error(f"Vector index error detected. Deleting corrupted index...")
-        # Delete corrupted index and force rebuild
+        # Delete corrupted index (and its per-upload copy) and force rebuild
         import shutil
+        active_digest = _read_active_digest()
+        if active_digest:
+            shutil.rmtree(os.path.join(INDEX_CACHE_DIR, active_digest), ignore_errors=True)
         shutil.rmtree(VECTOR_DIR, ignore_errors=True)
         os.makedirs(VECTOR_DIR, exist_ok=True)
         vectorstore = None
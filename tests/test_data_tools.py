@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("openpyxl")
+pytest.importorskip("langchain_community")
+
+from utils.data_tools import load_dataframe, load_excel_sheets, workbook_to_documents
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / "finance.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame({"region": ["north", "south"], "revenue": [10.5, 20.0]}).to_excel(
+            writer, sheet_name="Data", index=False
+        )
+        pd.DataFrame().to_excel(writer, sheet_name="Sheet2", index=False)
+    return str(path)
+
+
+def test_workbook_with_empty_sheet(workbook, tmp_path):
+    sheets = load_excel_sheets(workbook, cache_dir=str(tmp_path / "cache"))
+
+    assert list(sheets) == ["Data", "Sheet2"]
+    assert len(sheets["Sheet2"].columns) == 0
+
+    docs = workbook_to_documents(sheets, "finance.xlsx")
+    assert len(docs) == 4
+    assert "finance.xlsx (sheet: Data)" in docs[0].page_content
+    for doc in docs:
+        assert doc.page_content.startswith("Sheet: Data\n")
+        assert doc.metadata == {"source": "finance.xlsx", "sheet": "Data"}
+
+
+def test_cached_sheets_are_not_reparsed(workbook, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    first = load_excel_sheets(workbook, cache_dir=cache_dir)
+
+    def fail(self, sheet_name, *args, **kwargs):
+        raise AssertionError(f"re-parsed {sheet_name}")
+
+    monkeypatch.setattr(pd.ExcelFile, "parse", fail)
+    second = load_excel_sheets(workbook, cache_dir=cache_dir)
+
+    assert list(second) == list(first)
+    pd.testing.assert_frame_equal(second["Data"], first["Data"])
+
+
+def test_load_dataframe_reads_first_sheet_only(workbook, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    df = load_dataframe(workbook)
+
+    assert list(df.columns) == ["region", "revenue"]
+    assert not (tmp_path / "data").exists()
@@ -0,0 +1,63 @@
+import hashlib
+import io
+import os
+
+import pytest
+
+from utils.uploads import hash_file, hash_stream, save_upload
+
+
+def _upload(data: bytes, name: str):
+    file = io.BytesIO(data)
+    file.name = name
+    return file
+
+
+def test_hash_stream_matches_sha256():
+    data = b"x" * 10000
+    assert hash_stream(io.BytesIO(data), chunk_size=7) == hashlib.sha256(data).hexdigest()
+
+
+def test_identical_bytes_reuse_path_without_rewriting(tmp_path):
+    path, digest = save_upload(_upload(b"a,b\n1,2\n", "data.csv"), str(tmp_path))
+    assert os.path.basename(path) == f"{digest}.csv"
+    assert hash_file(path) == digest
+
+    mtime = os.stat(path).st_mtime_ns
+    os.utime(path, ns=(mtime - 10**9, mtime - 10**9))
+    again, again_digest = save_upload(_upload(b"a,b\n1,2\n", "other.csv"), str(tmp_path))
+
+    assert (again, again_digest) == (path, digest)
+    assert os.stat(path).st_mtime_ns == mtime - 10**9
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+
+
+def test_same_name_different_content_gets_distinct_paths(tmp_path):
+    first, _ = save_upload(_upload(b"a,b\n1,2\n", "data.csv"), str(tmp_path))
+    second, _ = save_upload(_upload(b"a,b\n3,4\n", "data.csv"), str(tmp_path))
+
+    assert first != second
+    assert sorted(os.listdir(tmp_path)) == sorted([os.path.basename(first), os.path.basename(second)])
+
+
+class _FailingUpload(io.BytesIO):
+    name = "broken.csv"
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.reads = 0
+
+    def read(self, size=-1):
+        # Hashing 10 bytes in 4-byte blocks takes 4 reads; fail on the second
+        # read of the write pass, after a block has already been written
+        self.reads += 1
+        if self.reads > 5:
+            raise OSError("connection dropped")
+        return super().read(size)
+
+
+def test_failed_write_leaves_no_part_file(tmp_path):
+    with pytest.raises(OSError):
+        save_upload(_FailingUpload(b"0123456789"), str(tmp_path), chunk_size=4)
+
+    assert os.listdir(tmp_path) == []
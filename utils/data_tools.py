@@ -2,6 +2,8 @@ import pandas as pd
 from langchain_core.documents import Document
 from langchain_community.document_loaders import PyPDFLoader
 
+from utils.excel import load_excel_sheets
+
 def load_dataframe(path: str):
     if path.endswith(".csv"):
         return pd.read_csv(path)
@@ -35,6 +37,20 @@ def dataframe_to_documents(df: pd.DataFrame, filename: str):
 
     return docs
 
+def workbook_to_documents(sheets: dict, filename: str):
+    docs = []
+    for sheet_name, df in sheets.items():
+        # Blank sheets read as frames without columns, which describe() rejects
+        if len(df.columns) == 0:
+            continue
+        # Label every chunk, not just the overview, so summaries of
+        # different sheets stay distinguishable after retrieval
+        for doc in dataframe_to_documents(df, f"{filename} (sheet: {sheet_name})"):
+            doc.page_content = f"Sheet: {sheet_name}\n{doc.page_content}"
+            doc.metadata.update({"source": filename, "sheet": sheet_name})
+            docs.append(doc)
+    return docs
+
 def load_pdf_documents(path: str):
     loader = PyPDFLoader(path)
     return loader.load()
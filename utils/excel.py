@@ -0,0 +1,40 @@
+import hashlib
+import os
+
+import pandas as pd
+
+from utils.uploads import hash_file
+
+SHEET_CACHE_DIR = "data/cache/sheets"
+
+def _sheet_cache_path(cache_dir: str, digest: str, sheet_name: str):
+    sheet_key = hashlib.sha256(sheet_name.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_dir, digest, f"{sheet_key}.pkl")
+
+def load_excel_sheets(path: str, digest: str = None, cache_dir: str = SHEET_CACHE_DIR):
+    """
+    Load every sheet of an XLSX workbook as {sheet name: DataFrame}, in workbook order.
+
+    Parsed sheets are cached on disk by (file hash, sheet name), so unchanged sheets
+    are never re-parsed. The workbook is opened once and uncached sheets are parsed
+    from that handle. Pass digest when the file's SHA-256 is already known.
+    """
+    if digest is None:
+        digest = hash_file(path)
+
+    sheets = {}
+    with pd.ExcelFile(path) as xls:
+        sheet_names = list(xls.sheet_names)
+        for name in sheet_names:
+            cache_path = _sheet_cache_path(cache_dir, digest, name)
+            if os.path.exists(cache_path):
+                sheets[name] = pd.read_pickle(cache_path)
+                continue
+
+            df = xls.parse(name)
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            df.to_pickle(cache_path + ".part", compression=None)
+            os.replace(cache_path + ".part", cache_path)
+            sheets[name] = df
+
+    return sheets
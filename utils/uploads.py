@@ -0,0 +1,50 @@
+import hashlib
+import os
+import tempfile
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def hash_stream(stream, chunk_size: int = CHUNK_SIZE) -> str:
+    """Return the SHA-256 hex digest of a binary stream, read in fixed-size blocks."""
+    hasher = hashlib.sha256()
+    for block in iter(lambda: stream.read(chunk_size), b""):
+        hasher.update(block)
+    return hasher.hexdigest()
+
+
+def hash_file(path: str, chunk_size: int = CHUNK_SIZE) -> str:
+    """Return the SHA-256 hex digest of a file on disk."""
+    with open(path, "rb") as f:
+        return hash_stream(f, chunk_size)
+
+
+def save_upload(file, upload_dir: str, chunk_size: int = CHUNK_SIZE):
+    """
+    Store an uploaded file content-addressed as <sha256><ext> in upload_dir.
+
+    The upload is hashed first; if a file with the same content already exists,
+    nothing is written. Otherwise it is streamed to a temporary file in fixed-size
+    blocks and atomically renamed into place. Returns (path, digest).
+    """
+    ext = os.path.splitext(file.name)[1].lower()
+
+    file.seek(0)
+    digest = hash_stream(file, chunk_size)
+    save_path = os.path.join(upload_dir, f"{digest}{ext}")
+    if os.path.exists(save_path):
+        return save_path, digest
+
+    file.seek(0)
+    fd, tmp_path = tempfile.mkstemp(dir=upload_dir, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for block in iter(lambda: file.read(chunk_size), b""):
+                f.write(block)
+        os.replace(tmp_path, save_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return save_path, digest